@@ -1,11 +1,14 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 import logging
+import math
 import os
 from datetime import datetime
 from typing import Any, Dict, List, Union, cast
 
 import boto3
+from botocore.exceptions import ClientError
 
 # Environment
 ECS_CLUSTER_NAME = os.environ.get("ECS_CLUSTER_NAME", "")
@@ -17,6 +20,10 @@ SCALE_OUT_COOLDOWN = int(os.environ.get("SCALE_OUT_COOLDOWN", 60))
 SCALE_IN_COOLDOWN = int(os.environ.get("SCALE_IN_COOLDOWN", 60))
 MINIMUM_TASK_COUNT = int(os.environ.get("MINIMUM_TASK_COUNT", 1))
 MAXIMUM_TASK_COUNT = int(os.environ.get("MAXIMUM_TASK_COUNT", 10))
+FOLLOWER_SERVICES = json.loads(os.environ.get("FOLLOWER_SERVICES", "[]"))
+
+# describe_services accepts at most 10 services per call
+DESCRIBE_SERVICES_BATCH_SIZE = 10
 
 # Logging
 logger = logging.getLogger()
@@ -57,19 +64,26 @@ def _get_alarm_states(alarm_name: str) -> List[Union[str, None]]:
     return alarm_states
 
 
-def _get_ecs_service(cluster_name: str, service_name: str) -> Dict[str, Any]:
+def _get_ecs_services(
+    cluster_name: str, service_names: List[str]
+) -> Dict[str, Dict[str, Any]]:
     """
-    Gets the ECS Service boto3 response object
+    Gets the ECS Service boto3 response objects for several services in a
+    cluster, batching the describe_services calls
 
     :param cluster_name: name of ECS Cluster
-    :param service_name: name of ECS Service
-    :returns: boto3 dictionary response object for service
+    :param service_names: names of ECS Services in the cluster
+    :returns: boto3 dictionary response objects keyed by service name
     """
-    services = ecs_client.describe_services(
-        cluster=cluster_name, services=[service_name]
-    )
-    service: Dict[str, Any] = cast(list, services["services"])[0]
-    return service
+    services: Dict[str, Dict[str, Any]] = {}
+    for i in range(0, len(service_names), DESCRIBE_SERVICES_BATCH_SIZE):
+        response = ecs_client.describe_services(
+            cluster=cluster_name,
+            services=service_names[i:i + DESCRIBE_SERVICES_BATCH_SIZE]
+        )
+        for service in cast(list, response["services"]):
+            services[service.get("serviceName")] = service
+    return services
 
 
 def _get_time_since_last_ecs_update(
@@ -97,7 +111,7 @@ def _trigger_scaling_action(
     end_count: int,
     cooldown: int,
     last_update: float
-) -> None:
+) -> int:
     """
     Triggers a scaling action for ECS
 
@@ -107,6 +121,7 @@ def _trigger_scaling_action(
     :param cooldown: time elapsed from previous scaling action where no scaling
     action should be performed
     :param last_update: time the last update was performed on the service
+    :returns: the desired count of the service after the scaling action
     """
     new_desired_count = current_count
     proposed_count = current_count
@@ -136,11 +151,114 @@ def _trigger_scaling_action(
             "Cooldown period has not been exceeded, no action taken"
         )
 
+    return new_desired_count
+
+
+def _get_follower_desired_count(
+    follower: Dict[str, Any], leader_count: int
+) -> int:
+    """
+    Calculates the desired count of a follower service from the leader's
+    desired count, bounded by the follower's minimum and maximum task count
+
+    :param follower: the follower configuration, ex: {"ratio": 3, "offset": 0,
+    "minimumTaskCount": 1, "maximumTaskCount": 30}
+    :param leader_count: the desired count of the leader service
+    :returns: the desired count for the follower service
+    """
+    ratio = float(follower.get("ratio", 1))
+    offset = float(follower.get("offset", 0))
+    minimum = int(follower.get("minimumTaskCount", 1))
+    maximum = int(
+        follower.get(
+            "maximumTaskCount",
+            _ceil_task_count(MAXIMUM_TASK_COUNT * ratio + offset)
+        )
+    )
+    proposed_count = _ceil_task_count(leader_count * ratio + offset)
+    return max(minimum, min(maximum, proposed_count))
+
+
+def _ceil_task_count(count: float) -> int:
+    """
+    Rounds a task count up, ignoring floating point error so that exact
+    multiples are not rounded up, ex: 50 * 0.14 is 7, not 8
+
+    :param count: the calculated task count
+    :returns: the task count rounded up to a whole task
+    """
+    return math.ceil(round(count, 9))
+
+
+def _scale_followers(
+    followers: List[Dict[str, Any]],
+    services: Dict[str, Dict[str, Dict[str, Any]]],
+    leader_count: int
+) -> None:
+    """
+    Sets the desired count of every follower service to match the leader's
+    desired count by its configured ratio. A follower that is not active or
+    fails to update is logged and skipped so the remaining followers are
+    still scaled
+
+    :param followers: the follower configurations
+    :param services: boto3 service response objects keyed by cluster name and
+    then service name
+    :param leader_count: the desired count of the leader service
+    """
+    for follower in followers:
+        cluster_name = follower.get("clusterName", ECS_CLUSTER_NAME)
+        service_name = follower["serviceName"]
+        service = services.get(cluster_name, {}).get(service_name)
+        if service is None:
+            logger.warning(
+                f"Follower service {service_name} not found in cluster {cluster_name}, no action taken"
+            )
+            continue
+        if service.get("status") != "ACTIVE":
+            logger.warning(
+                f"Follower service {service_name} in cluster {cluster_name} is {service.get('status')}, no action taken"
+            )
+            continue
+
+        current_count = service.get("desiredCount")
+        new_desired_count = _get_follower_desired_count(follower, leader_count)
+        if new_desired_count != current_count:
+            try:
+                ecs_client.update_service(
+                    cluster=cluster_name,
+                    service=service_name,
+                    desiredCount=new_desired_count
+                )
+            except ClientError as e:
+                # Keep scaling the remaining followers
+                logger.error(
+                    f"Failed to change desired count of follower {service_name}: {e}"
+                )
+                continue
+            logger.info(
+                f"Changed desired count of follower {service_name} from {current_count} to {new_desired_count}"
+            )
+
 
 def handler(event, context):
     alarm_states = _get_alarm_states(SCALE_ALARM_NAME)
     logger.info(alarm_states)
-    service = _get_ecs_service(ECS_CLUSTER_NAME, ECS_SERVICE_NAME)
+
+    # Describe the leader and all followers with one batched call per cluster
+    service_names_by_cluster: Dict[str, List[str]] = {
+        ECS_CLUSTER_NAME: [ECS_SERVICE_NAME]
+    }
+    for follower in FOLLOWER_SERVICES:
+        cluster_name = follower.get("clusterName", ECS_CLUSTER_NAME)
+        service_names = service_names_by_cluster.setdefault(cluster_name, [])
+        if follower["serviceName"] not in service_names:
+            service_names.append(follower["serviceName"])
+    services = {
+        cluster_name: _get_ecs_services(cluster_name, service_names)
+        for cluster_name, service_names in service_names_by_cluster.items()
+    }
+    service = services[ECS_CLUSTER_NAME][ECS_SERVICE_NAME]
 
     desired_count = service.get("desiredCount")
     running_count = service.get("runningCount")
@@ -149,12 +267,13 @@ def handler(event, context):
         logger.info(
             "Task count has not caught up with desired count, no action taken"
         )
+        _scale_followers(FOLLOWER_SERVICES, services, desired_count)
         return
 
     last_updated = _get_time_since_last_ecs_update(service)
 
     if alarm_states is not None and "ALARM" in alarm_states:
-        _trigger_scaling_action(
+        desired_count = _trigger_scaling_action(
             type_="OUT",
             increment=SCALE_OUT_INCREMENT,
             current_count=desired_count,
@@ -163,7 +282,7 @@ def handler(event, context):
             last_update=last_updated
         )
     elif alarm_states is not None and all(x == "OK" for x in alarm_states):
-        _trigger_scaling_action(
+        desired_count = _trigger_scaling_action(
             type_="IN",
             increment=SCALE_IN_INCREMENT,
             current_count=desired_count,
@@ -172,5 +291,7 @@ def handler(event, context):
             last_update=last_updated
         )
 
+    _scale_followers(FOLLOWER_SERVICES, services, desired_count)
+
 if __name__ == "__main__":
     handler({}, {})
\ No newline at end of file
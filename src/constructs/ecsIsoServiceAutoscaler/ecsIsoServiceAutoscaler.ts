@@ -4,7 +4,7 @@ SPDX-License-Identifier: Apache-2.0
 */
 
 import * as path from 'path';
-import { Duration } from 'aws-cdk-lib';
+import { Annotations, Duration, Stack } from 'aws-cdk-lib';
 import { AlarmBase } from 'aws-cdk-lib/aws-cloudwatch';
 import { Cluster, IService } from 'aws-cdk-lib/aws-ecs';
 import { Rule, Schedule } from 'aws-cdk-lib/aws-events';
@@ -13,6 +13,46 @@ import { Effect, IRole, PolicyStatement } from 'aws-cdk-lib/aws-iam';
 import { Code, Function, Runtime } from 'aws-cdk-lib/aws-lambda';
 import { Construct } from 'constructs';
 
+export interface EcsIsoServiceAutoscalerFollower {
+  /**
+   * The cluster the follower service resides in.
+   *
+   * @default the cluster of the scaled (leader) service
+   */
+  readonly ecsCluster?: Cluster;
+  /**
+   * The ECS service whose desired count follows the scaled (leader) service.
+   */
+  readonly ecsService: IService;
+  /**
+   * The number of follower tasks per leader task.
+   *
+   * The follower desired count is `ceil(leaderDesiredCount * ratio + offset)`,
+   * bounded by `minimumTaskCount` and `maximumTaskCount`.
+   *
+   * @default 1
+   */
+  readonly ratio?: number;
+  /**
+   * The number of tasks added to the follower desired count after applying the ratio.
+   *
+   * @default 0
+   */
+  readonly offset?: number;
+  /**
+   * The minimum number of tasks the follower service will have.
+   *
+   * @default 1
+   */
+  readonly minimumTaskCount?: number;
+  /**
+   * The maximum number of tasks the follower service will scale out to.
+   *
+   * @default `ceil(maximumTaskCount * ratio + offset)` using the scaled (leader) service's `maximumTaskCount`
+   */
+  readonly maximumTaskCount?: number;
+}
+
 export interface EcsIsoServiceAutoscalerProps {
   /**
    * Optional IAM role to attach to the created lambda to adjust the desired count on the ECS Service
@@ -45,6 +85,10 @@ export interface EcsIsoServiceAutoscalerProps {
    *  }
    *}
    * ```
+   *
+   * If `followerServices` are set, the role also needs `ecs:DescribeServices` and `ecs:UpdateService` on every
+   * follower service, with one statement per follower cluster. The scaled service and its followers are described
+   * together, so a role missing a follower also stops the scaled service from scaling.
    * @default A role is created for you with least privilege IAM policy
    */
   readonly role?: IRole;
@@ -99,6 +143,18 @@ export interface EcsIsoServiceAutoscalerProps {
    * @default 60 seconds
    */
   readonly scaleInCooldown?: Duration;
+  /**
+   * Services whose desired count is set from the scaled service's desired count in the same invocation.
+   *
+   * All services are read with one `ecs:DescribeServices` call per cluster and updated together,
+   * so dependent services scale in phase with the scaled service rather than lagging behind it.
+   *
+   * If you pass your own `role`, it must allow `ecs:DescribeServices` and `ecs:UpdateService` on every follower
+   * service, with one statement per follower cluster, otherwise the scaled service stops scaling too.
+   *
+   * @default no follower services
+   */
+  readonly followerServices?: EcsIsoServiceAutoscalerFollower[];
 }
 
 /**
@@ -127,8 +183,51 @@ export class EcsIsoServiceAutoscaler extends Construct {
       scaleInIncrement = 1,
       scaleOutCooldown = Duration.seconds(60),
       scaleInCooldown = Duration.seconds(60),
+      followerServices = [],
     } = props;
 
+    const followedServices = new Set<IService>([props.ecsService]);
+    const followers = followerServices.map((follower) => {
+      if (follower.ecsService === props.ecsService) {
+        throw new Error('The scaled service can not also be a follower');
+      }
+      if (followedServices.has(follower.ecsService)) {
+        throw new Error('Follower services must not be repeated');
+      }
+      followedServices.add(follower.ecsService);
+
+      const { ratio = 1, offset = 0 } = follower;
+      if (ratio <= 0) {
+        throw new Error('Follower ratio must be greater than 0');
+      }
+      // The follower count needed when the scaled service is at its maximum
+      const followerCountAtMaximum = Math.ceil(
+        Number((maximumTaskCount * ratio + offset).toFixed(9))
+      );
+      const {
+        minimumTaskCount: followerMinimumTaskCount = 1,
+        maximumTaskCount: followerMaximumTaskCount = followerCountAtMaximum,
+      } = follower;
+      if (followerMinimumTaskCount > followerMaximumTaskCount) {
+        throw new Error(
+          'Follower minimumTaskCount must not be greater than maximumTaskCount'
+        );
+      }
+      if (followerMaximumTaskCount < followerCountAtMaximum) {
+        Annotations.of(this).addWarning(
+          `Follower ${follower.ecsService.node.path} maximumTaskCount (${followerMaximumTaskCount}) is below the ${followerCountAtMaximum} tasks its ratio requires at the scaled service's maximumTaskCount, it will stop following once it reaches its maximum`
+        );
+      }
+      return {
+        clusterName: (follower.ecsCluster ?? props.ecsCluster).clusterName,
+        serviceName: follower.ecsService.serviceName,
+        ratio,
+        offset,
+        minimumTaskCount: followerMinimumTaskCount,
+        maximumTaskCount: followerMaximumTaskCount,
+      };
+    });
+
     this.ecsScalingManagerFunction = new Function(
       this,
       `${id}-EcsServiceScalingManager`,
@@ -152,6 +251,7 @@ export class EcsIsoServiceAutoscaler extends Construct {
           SCALE_OUT_COOLDOWN: scaleOutCooldown.toSeconds().toString(),
           SCALE_IN_INCREMENT: scaleInIncrement.toString(),
           SCALE_IN_COOLDOWN: scaleInCooldown.toSeconds().toString(),
+          FOLLOWER_SERVICES: Stack.of(this).toJsonString(followers),
         },
       }
     );
@@ -177,18 +277,32 @@ export class EcsIsoServiceAutoscaler extends Construct {
         })
       );
 
-      this.ecsScalingManagerFunction.addToRolePolicy(
-        new PolicyStatement({
-          actions: ['ecs:DescribeServices', 'ecs:UpdateService'],
-          effect: Effect.ALLOW,
-          resources: [props.ecsService.serviceArn],
-          conditions: {
-            StringLike: {
-              'ecs:cluster': props.ecsCluster.clusterArn,
+      // Group the scaled service and its followers by cluster, one statement per cluster
+      const serviceArnsByCluster = new Map<Cluster, string[]>([
+        [props.ecsCluster, [props.ecsService.serviceArn]],
+      ]);
+      followerServices.forEach((follower) => {
+        const cluster = follower.ecsCluster ?? props.ecsCluster;
+        serviceArnsByCluster.set(cluster, [
+          ...(serviceArnsByCluster.get(cluster) ?? []),
+          follower.ecsService.serviceArn,
+        ]);
+      });
+
+      serviceArnsByCluster.forEach((serviceArns, cluster) => {
+        this.ecsScalingManagerFunction.addToRolePolicy(
+          new PolicyStatement({
+            actions: ['ecs:DescribeServices', 'ecs:UpdateService'],
+            effect: Effect.ALLOW,
+            resources: serviceArns,
+            conditions: {
+              StringLike: {
+                'ecs:cluster': cluster.clusterArn,
+              },
             },
-          },
-        })
-      );
+          })
+        );
+      });
     }
   }
 }
@@ -5,7 +5,7 @@ SPDX-License-Identifier: Apache-2.0
 import { spawnSync } from 'child_process';
 import * as path from 'path';
 import { CfnElement, Duration, Stack } from 'aws-cdk-lib';
-import { Match, Template } from 'aws-cdk-lib/assertions';
+import { Annotations, Match, Template } from 'aws-cdk-lib/assertions';
 import { Alarm } from 'aws-cdk-lib/aws-cloudwatch';
 import {
   CfnCluster,
@@ -21,6 +21,16 @@ import { EcsIsoServiceAutoscaler } from '../../../src/constructs/ecsIsoServiceAu
 
 let stack: Stack;
 
+const logicalIdOf = (
+  scope: IConstruct,
+  type: typeof CfnService | typeof CfnCluster
+): string => {
+  const resource = scope.node.findAll().find((x: IConstruct) => {
+    return x instanceof type;
+  });
+  return stack.getLogicalId(resource as CfnElement).toString();
+};
+
 describe('Python Lambda function tests', () => {
   test('lambda python pytest', () => {
     const result = spawnSync(path.join(__dirname, 'resources', 'test.sh'), {
@@ -33,6 +43,7 @@ describe('Python Lambda function tests', () => {
 describe('EcsIsoServiceAutoscaler construct', () => {
   let cluster: Cluster;
   let service: FargateService;
+  let followerService: FargateService;
   let alarm: Alarm;
   let role: Role;
   beforeEach(() => {
@@ -52,6 +63,10 @@ describe('EcsIsoServiceAutoscaler construct', () => {
       taskDefinition,
       desiredCount: 5,
     });
+    followerService = new FargateService(stack, 'TestFollowerService', {
+      cluster,
+      taskDefinition,
+    });
     role = new Role(stack, 'TestTaskRole', {
       assumedBy: new ServicePrincipal('lambda.amazonaws.com'),
     });
@@ -184,6 +199,213 @@ describe('EcsIsoServiceAutoscaler construct', () => {
       1
     );
   });
+  test('Follower services are passed to the Lambda and granted to its role', () => {
+    new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+      ecsCluster: cluster,
+      ecsService: service,
+      scaleAlarm: alarm,
+      followerServices: [
+        {
+          ecsService: followerService,
+          ratio: 3,
+          maximumTaskCount: 30,
+        },
+      ],
+    });
+
+    const template = Template.fromStack(stack);
+
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Environment: {
+        Variables: Match.objectLike({
+          FOLLOWER_SERVICES: {
+            'Fn::Join': Match.arrayWith([
+              Match.arrayWith([
+                Match.stringLikeRegexp(
+                  '"ratio":3,"offset":0,"minimumTaskCount":1,"maximumTaskCount":30'
+                ),
+              ]),
+            ]),
+          },
+        }),
+      },
+    });
+
+    template.hasResourceProperties('AWS::IAM::Policy', {
+      PolicyDocument: {
+        Statement: Match.arrayWith([
+          Match.objectLike({
+            Action: ['ecs:DescribeServices', 'ecs:UpdateService'],
+            Resource: [
+              {
+                Ref: logicalIdOf(service, CfnService),
+              },
+              {
+                Ref: logicalIdOf(followerService, CfnService),
+              },
+            ],
+          }),
+        ]),
+      },
+    });
+  });
+  test('Follower with minimum above maximum throws an error', () => {
+    expect(() => {
+      new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+        ecsCluster: cluster,
+        ecsService: service,
+        scaleAlarm: alarm,
+        followerServices: [
+          {
+            ecsService: followerService,
+            minimumTaskCount: 5,
+            maximumTaskCount: 2,
+          },
+        ],
+      });
+    }).toThrow(
+      'Follower minimumTaskCount must not be greater than maximumTaskCount'
+    );
+  });
+  test('Follower with ratio of 0 throws an error', () => {
+    expect(() => {
+      new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+        ecsCluster: cluster,
+        ecsService: service,
+        scaleAlarm: alarm,
+        followerServices: [{ ecsService: followerService, ratio: 0 }],
+      });
+    }).toThrow('Follower ratio must be greater than 0');
+  });
+  test('Scaled service as a follower throws an error', () => {
+    expect(() => {
+      new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+        ecsCluster: cluster,
+        ecsService: service,
+        scaleAlarm: alarm,
+        followerServices: [{ ecsService: service }],
+      });
+    }).toThrow('The scaled service can not also be a follower');
+  });
+  test('Repeated follower throws an error', () => {
+    expect(() => {
+      new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+        ecsCluster: cluster,
+        ecsService: service,
+        scaleAlarm: alarm,
+        followerServices: [
+          { ecsService: followerService },
+          { ecsService: followerService, ratio: 2 },
+        ],
+      });
+    }).toThrow('Follower services must not be repeated');
+  });
+  test('Follower maximum defaults to the scaled service maximum by ratio', () => {
+    new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+      ecsCluster: cluster,
+      ecsService: service,
+      scaleAlarm: alarm,
+      maximumTaskCount: 12,
+      followerServices: [{ ecsService: followerService, ratio: 3, offset: 1 }],
+    });
+
+    const template = Template.fromStack(stack);
+
+    template.hasResourceProperties('AWS::Lambda::Function', {
+      Environment: {
+        Variables: Match.objectLike({
+          FOLLOWER_SERVICES: {
+            'Fn::Join': Match.arrayWith([
+              Match.arrayWith([
+                Match.stringLikeRegexp(
+                  '"ratio":3,"offset":1,"minimumTaskCount":1,"maximumTaskCount":37'
+                ),
+              ]),
+            ]),
+          },
+        }),
+      },
+    });
+    Annotations.fromStack(stack).hasNoWarning(
+      '*',
+      Match.stringLikeRegexp('maximumTaskCount')
+    );
+  });
+  test('Follower maximum below its ratio of the scaled service maximum warns', () => {
+    new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+      ecsCluster: cluster,
+      ecsService: service,
+      scaleAlarm: alarm,
+      followerServices: [
+        { ecsService: followerService, ratio: 3, maximumTaskCount: 10 },
+      ],
+    });
+
+    Annotations.fromStack(stack).hasWarning(
+      '*',
+      Match.stringLikeRegexp('maximumTaskCount \\(10\\) is below the 30 tasks')
+    );
+  });
+  test('Follower in another cluster is granted in a statement for that cluster', () => {
+    const otherCluster = new Cluster(stack, 'TestOtherCluster');
+    const otherTaskDefinition = new FargateTaskDefinition(
+      stack,
+      'TestOtherTaskDefinition'
+    );
+    otherTaskDefinition.addContainer('SomeContainer', {
+      image: ContainerImage.fromRegistry(
+        'public.ecr.aws/ecs-sample-image/amazon-ecs-sample:latest'
+      ),
+    });
+    const otherService = new FargateService(stack, 'TestOtherService', {
+      cluster: otherCluster,
+      taskDefinition: otherTaskDefinition,
+    });
+
+    new EcsIsoServiceAutoscaler(stack, 'TestEcsIsoServiceAutoscaler', {
+      ecsCluster: cluster,
+      ecsService: service,
+      scaleAlarm: alarm,
+      followerServices: [
+        { ecsService: otherService, ecsCluster: otherCluster },
+      ],
+    });
+
+    const template = Template.fromStack(stack);
+
+    template.hasResourceProperties('AWS::IAM::Policy', {
+      PolicyDocument: {
+        Statement: Match.arrayWith([
+          Match.objectLike({
+            Action: ['ecs:DescribeServices', 'ecs:UpdateService'],
+            Resource: {
+              Ref: logicalIdOf(service, CfnService),
+            },
+            Condition: {
+              StringLike: {
+                'ecs:cluster': {
+                  'Fn::GetAtt': [logicalIdOf(cluster, CfnCluster), 'Arn'],
+                },
+              },
+            },
+          }),
+          Match.objectLike({
+            Action: ['ecs:DescribeServices', 'ecs:UpdateService'],
+            Resource: {
+              Ref: logicalIdOf(otherService, CfnService),
+            },
+            Condition: {
+              StringLike: {
+                'ecs:cluster': {
+                  'Fn::GetAtt': [logicalIdOf(otherCluster, CfnCluster), 'Arn'],
+                },
+              },
+            },
+          }),
+        ]),
+      },
+    });
+  });
   test('Autoscaler Lambda is accessible as a property', () => {
     const autoScaler = new EcsIsoServiceAutoscaler(
       stack,
@@ -4,13 +4,17 @@ from typing import Any, Dict
 from unittest.mock import patch
 
 import pytest
+from botocore.exceptions import ClientError
 
 with patch("boto3.client"):
     from ecs_scaling_manager import ( #type: ignore 
         _get_alarm_states,
-        _get_ecs_service,
+        _get_ecs_services,
+        _get_follower_desired_count,
         _get_time_since_last_ecs_update,
+        _scale_followers,
         _trigger_scaling_action,
+        handler,
     )
 
 def test_get_alarm_states(boto3_cw_alarm_not_ok_response):
@@ -43,23 +47,6 @@ def test_get_alarm_states(boto3_cw_alarm_ok_response):
     assert "ALARM" not in alarm_states
 
 
-def test_get_ecs_service(boto3_ecs_service_response):
-    """
-    Tests getting ECS Service data from a mocked boto3 response. The expected
-    response should be in a dictionary format {...} that contains the single
-    ECS service.
-    """
-    with patch("ecs_scaling_manager.ecs_client.describe_services") as mock:
-        mock.return_value = boto3_ecs_service_response
-        service = _get_ecs_service(
-            cluster_name="Cluster", service_name="Service"
-        )
-
-    assert mock.called
-    assert isinstance(service, dict)
-    assert "deployments" in service
-
-
 @pytest.mark.parametrize('boto3_ecs_service_response', [180], indirect=True)
 def test_get_time_since_last_ecs_update(boto3_ecs_service_response):
     """
@@ -68,9 +55,10 @@ def test_get_time_since_last_ecs_update(boto3_ecs_service_response):
     """
     with patch("ecs_scaling_manager.ecs_client.describe_services") as mock:
         mock.return_value = boto3_ecs_service_response
-        service = _get_ecs_service(
-            cluster_name="Cluster", service_name="Service"
+        services = _get_ecs_services(
+            cluster_name="Cluster", service_names=["Service"]
         )
+        service = services["Task-Service292C7250-9ncKQXCQxd5E"]
 
         time_since = _get_time_since_last_ecs_update(service)
 
@@ -196,4 +184,330 @@ def test_trigger_scaling_action_out_to_limit():
         call_args: Dict[str, Any] = mock.call_args[1]
 
     assert mock.called == True
-    assert call_args.get("desiredCount") == 50
\ No newline at end of file
+    assert call_args.get("desiredCount") == 50
+
+
+def test_get_ecs_services_batches_describe_calls(boto3_ecs_service_response):
+    """
+    Tests getting several ECS Services in one cluster. The describe_services
+    call accepts at most 10 services, so 12 services should take 2 calls and
+    the response should be keyed by service name.
+    """
+    service_names = [f"Service{i}" for i in range(12)]
+    with patch("ecs_scaling_manager.ecs_client.describe_services") as mock:
+        mock.return_value = boto3_ecs_service_response
+        services = _get_ecs_services(
+            cluster_name="Cluster", service_names=service_names
+        )
+
+    assert mock.call_count == 2
+    assert mock.call_args_list[0][1].get("services") == service_names[:10]
+    assert mock.call_args_list[1][1].get("services") == service_names[10:]
+    assert "Task-Service292C7250-9ncKQXCQxd5E" in services
+
+
+def test_get_follower_desired_count_by_ratio():
+    """
+    Tests calculating a follower desired count from the leader desired count,
+    ratio and offset, rounding partial tasks up.
+    """
+    follower = {
+        "ratio": 1.5,
+        "offset": 1,
+        "minimumTaskCount": 1,
+        "maximumTaskCount": 30
+    }
+
+    assert _get_follower_desired_count(follower, leader_count=3) == 6
+
+
+def test_get_follower_desired_count_to_limits():
+    """
+    Tests that the follower desired count stays within the follower's own
+    minimum and maximum task count.
+    """
+    follower = {"ratio": 3, "minimumTaskCount": 2, "maximumTaskCount": 20}
+
+    assert _get_follower_desired_count(follower, leader_count=0) == 2
+    assert _get_follower_desired_count(follower, leader_count=10) == 20
+
+
+def test_get_follower_desired_count_fractional_offset():
+    """
+    Tests that a fractional offset is added before rounding up rather than
+    being truncated.
+    """
+    follower = {"ratio": 1, "offset": 0.5, "maximumTaskCount": 10}
+
+    assert _get_follower_desired_count(follower, leader_count=2) == 3
+
+
+def test_get_follower_desired_count_exact_multiple():
+    """
+    Tests that an exact multiple of the ratio is not rounded up by floating
+    point error, 50 * 0.14 evaluates to 7.000000000000001 but should be 7.
+    """
+    follower = {"ratio": 0.14, "maximumTaskCount": 10}
+
+    assert _get_follower_desired_count(follower, leader_count=50) == 7
+
+
+def test_get_follower_desired_count_default_maximum():
+    """
+    Tests that without an explicit maximum the follower is bounded by the
+    leader's maximum task count scaled by the ratio, not by a fixed count.
+    """
+    follower = {"ratio": 3}
+
+    with patch("ecs_scaling_manager.MAXIMUM_TASK_COUNT", 10):
+        assert _get_follower_desired_count(follower, leader_count=8) == 24
+        assert _get_follower_desired_count(follower, leader_count=12) == 30
+
+
+def test_scale_followers(boto3_ecs_service_response):
+    """
+    Tests that followers are updated to the leader desired count by ratio in
+    their own cluster, and that followers already at that count are left alone.
+    """
+    service = boto3_ecs_service_response["services"][0]
+    services = {
+        "Cluster": {"Worker": dict(service, serviceName="Worker")},
+        "OtherCluster": {"Indexer": dict(service, serviceName="Indexer")},
+    }
+    followers = [
+        {
+            "clusterName": "Cluster",
+            "serviceName": "Worker",
+            "ratio": 3,
+            "minimumTaskCount": 1,
+            "maximumTaskCount": 30
+        },
+        {
+            "clusterName": "OtherCluster",
+            "serviceName": "Indexer",
+            "ratio": 0.75,
+            "minimumTaskCount": 1,
+            "maximumTaskCount": 10
+        },
+    ]
+    with patch("ecs_scaling_manager.ecs_client.update_service") as mock:
+        _scale_followers(followers, services, leader_count=4)
+
+    assert mock.call_count == 1
+    assert mock.call_args[1] == {
+        "cluster": "Cluster", "service": "Worker", "desiredCount": 12
+    }
+
+
+def _mock_describe_services(
+    service_response, running_counts=None, statuses=None
+):
+    """
+    Builds a describe_services side effect returning a copy of the mocked
+    service for every requested service name.
+    """
+    running_counts = running_counts or {}
+    statuses = statuses or {}
+    base_service = service_response["services"][0]
+
+    def describe_services(cluster, services):
+        return {
+            "services": [
+                dict(
+                    base_service,
+                    serviceName=name,
+                    runningCount=running_counts.get(
+                        name, base_service["runningCount"]
+                    ),
+                    status=statuses.get(name, base_service["status"])
+                )
+                for name in services
+            ]
+        }
+
+    return describe_services
+
+
+def _updated_counts(mock) -> Dict[str, int]:
+    """
+    Collects the desired count each service was updated to, keyed by service
+    name.
+    """
+    return {
+        call[1]["service"]: call[1]["desiredCount"]
+        for call in mock.call_args_list
+    }
+
+
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.MAXIMUM_TASK_COUNT", 10)
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30}
+])
+def test_handler_scale_out_scales_followers(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that a scale OUT of the leader updates the leader to N+1 and sets the
+    follower from the post-scaling leader count, with a single describe call
+    for the cluster they share.
+    """
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response
+        )
+        handler({}, {})
+
+    assert ecs.describe_services.call_count == 1
+    assert ecs.describe_services.call_args[1] == {
+        "cluster": "Cluster", "services": ["Api", "Worker"]
+    }
+    assert _updated_counts(ecs.update_service) == {"Api": 4, "Worker": 12}
+
+
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.MAXIMUM_TASK_COUNT", 10)
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30},
+    {"clusterName": "OtherCluster", "serviceName": "Indexer", "ratio": 2, "maximumTaskCount": 20},
+])
+def test_handler_describes_once_per_cluster(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that a follower in another cluster causes exactly one extra describe
+    call, and that followers in each cluster are updated in that cluster.
+    """
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response
+        )
+        handler({}, {})
+
+    assert ecs.describe_services.call_count == 2
+    assert [call[1] for call in ecs.describe_services.call_args_list] == [
+        {"cluster": "Cluster", "services": ["Api", "Worker"]},
+        {"cluster": "OtherCluster", "services": ["Indexer"]},
+    ]
+    assert _updated_counts(ecs.update_service) == {
+        "Api": 4, "Worker": 12, "Indexer": 8
+    }
+    indexer_call = [
+        call[1] for call in ecs.update_service.call_args_list
+        if call[1]["service"] == "Indexer"
+    ][0]
+    assert indexer_call["cluster"] == "OtherCluster"
+
+
+@pytest.mark.parametrize('boto3_ecs_service_response', [30], indirect=True)
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.SCALE_OUT_COOLDOWN", 60)
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30}
+])
+def test_handler_inside_cooldown_aligns_followers(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that inside the leader's cooldown window the leader is not scaled,
+    but followers are still aligned to the leader's current desired count.
+    """
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response
+        )
+        handler({}, {})
+
+    assert _updated_counts(ecs.update_service) == {"Worker": 9}
+
+
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30}
+])
+def test_handler_leader_catching_up_aligns_followers(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that while the leader's running count has not caught up with its
+    desired count the leader is not scaled, but followers are aligned to the
+    leader's desired count.
+    """
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response, running_counts={"Api": 2}
+        )
+        handler({}, {})
+
+    assert _updated_counts(ecs.update_service) == {"Worker": 9}
+
+
+
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Draining", "ratio": 2, "maximumTaskCount": 20},
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30},
+])
+def test_handler_skips_inactive_followers(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that a follower which is not ACTIVE is skipped without calling
+    update_service, and that the followers after it are still scaled.
+    """
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response, statuses={"Draining": "DRAINING"}
+        )
+        handler({}, {})
+
+    assert _updated_counts(ecs.update_service) == {"Api": 4, "Worker": 12}
+
+
+@patch("ecs_scaling_manager.ECS_CLUSTER_NAME", "Cluster")
+@patch("ecs_scaling_manager.ECS_SERVICE_NAME", "Api")
+@patch("ecs_scaling_manager.FOLLOWER_SERVICES", [
+    {"clusterName": "Cluster", "serviceName": "Failing", "ratio": 2, "maximumTaskCount": 20},
+    {"clusterName": "Cluster", "serviceName": "Worker", "ratio": 3, "maximumTaskCount": 30},
+])
+def test_handler_continues_after_follower_update_error(
+    boto3_ecs_service_response, boto3_cw_alarm_not_ok_response
+):
+    """
+    Tests that a ClientError while updating one follower is logged and the
+    followers after it are still scaled.
+    """
+    def update_service(cluster, service, desiredCount):
+        if service == "Failing":
+            raise ClientError(
+                {"Error": {"Code": "ServiceNotActiveException", "Message": "Service was not ACTIVE."}},
+                "UpdateService"
+            )
+
+    with patch("ecs_scaling_manager.cw_client.describe_alarms") as alarms, \
+            patch("ecs_scaling_manager.ecs_client") as ecs:
+        alarms.return_value = boto3_cw_alarm_not_ok_response
+        ecs.describe_services.side_effect = _mock_describe_services(
+            boto3_ecs_service_response
+        )
+        ecs.update_service.side_effect = update_service
+        handler({}, {})
+
+    assert _updated_counts(ecs.update_service) == {
+        "Api": 4, "Failing": 8, "Worker": 12
+    }